@@ -51,7 +51,6 @@ class SignalClient:
         if group_id:
             if group_id.startswith("group."):
                 # Decode the base64 part after "group." to get internal ID
-                import base64
                 try:
                     encoded = group_id[6:]  # Remove "group." prefix
                     self._internal_group_id = base64.b64decode(encoded).decode("utf-8")
@@ -0,0 +1 @@
+"""Shared mock helpers for satisfactory-signal tests."""
@@ -0,0 +1,68 @@
+"""Transport stub for SignalClient tests."""
+
+import io
+import json as json_module
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter that answers requests from a table of canned routes.
+
+    Mount it on a real requests.Session so tests exercise the actual
+    session wiring (headers, JSON encoding, URLs, timeouts) without any
+    network. Unregistered routes answer 404.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes: dict[tuple[str, str], tuple[int, Any, Exception | None]] = {}
+        self.requests: list[requests.PreparedRequest] = []
+        self.timeouts: list[Any] = []
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        status: int = 200,
+        json: Any = None,
+        exc: Exception | None = None,
+    ) -> None:
+        """Register (or replace) the response for a method and URL path.
+
+        If exc is given, the route raises it instead of responding.
+        """
+        self.routes[(method, path)] = (status, json, exc)
+
+    def reset(self) -> None:
+        """Forget all routes and recorded requests."""
+        self.routes.clear()
+        self.requests.clear()
+        self.timeouts.clear()
+
+    def last_json(self) -> Any:
+        """Return the decoded JSON body of the most recent request."""
+        return json_module.loads(self.requests[-1].body)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        self.requests.append(request)
+        self.timeouts.append(kwargs.get("timeout"))
+        route = (request.method or "", urlsplit(request.url or "").path)
+        status, body, exc = self.routes.get(route, (404, None, None))
+        if exc is not None:
+            raise exc
+
+        # Same shape HTTPAdapter.build_response produces: the body is read from raw
+        response = requests.Response()
+        response.status_code = status
+        response.raw = io.BytesIO(b"" if body is None else json_module.dumps(body).encode("utf-8"))
+        response.headers["Content-Type"] = "application/json"
+        response.url = request.url or ""
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
@@ -1,629 +1,494 @@
 """Tests for signal_client module."""
 
-from unittest.mock import MagicMock
+import dataclasses
+
+import pytest
+import requests
+from mocks.signal_mocks import StubAdapter
 
 from signal_client import SignalClient, SignalMessage
+from text_processing import Attachment, Mention
+
+API_URL = "http://localhost:8080"
+PHONE = "+1234567890"
+OTHER_PHONE = "+0987654321"
+
+# Base64 encode "testgroupid" -> dGVzdGdyb3VwaWQ=
+GROUP_ID_PREFIXED = "group.dGVzdGdyb3VwaWQ="
+GROUP_ID_DECODED = "testgroupid"
+INVALID_GROUP_ID = "group.invalid!!!base64"
+
+# Raw envelopes shared by the _parse_message tests (the parser never mutates its input)
+RAW_SIMPLE = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "sourceName": "TestUser",
+        "sourceUuid": "uuid-123",
+        "dataMessage": {
+            "message": "Hello, world!",
+            "timestamp": 1234567890000,
+        },
+    }
+}
+
+RAW_GROUP = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "sourceName": "TestUser",
+        "sourceUuid": "uuid-123",
+        "dataMessage": {
+            "message": "Hello group!",
+            "timestamp": 1234567890000,
+            "groupInfo": {
+                "groupId": GROUP_ID_DECODED,
+            },
+        },
+    }
+}
+
+RAW_ATTACHMENTS = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "sourceName": "TestUser",
+        "dataMessage": {
+            "message": "Check this out",
+            "timestamp": 1234567890000,
+            "attachments": [
+                {"contentType": "image/jpeg", "filename": "photo.jpg"},
+            ],
+        },
+    }
+}
+
+RAW_MENTIONS = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "sourceName": "TestUser",
+        "dataMessage": {
+            "message": "\ufffc check this",
+            "timestamp": 1234567890000,
+            "mentions": [
+                {"start": 0, "length": 1, "name": "Alice"},
+            ],
+        },
+    }
+}
+
+RAW_STICKER = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "sourceName": "TestUser",
+        "dataMessage": {
+            "message": "",
+            "timestamp": 1234567890000,
+            "sticker": {"packId": "abc", "stickerId": 1},
+        },
+    }
+}
+
+RAW_NO_DATAMSG = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+    }
+}
+
+RAW_EMPTY = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "dataMessage": {
+            "message": "",
+            "timestamp": 1234567890000,
+        },
+    }
+}
+
+RAW_FROM_SELF = {
+    "envelope": {
+        "sourceNumber": PHONE,  # Same as client
+        "dataMessage": {
+            "message": "Hello",
+            "timestamp": 1234567890000,
+        },
+    }
+}
+
+RAW_NO_NAME = {
+    "envelope": {
+        "sourceNumber": OTHER_PHONE,
+        "dataMessage": {
+            "message": "Hello",
+            "timestamp": 1234567890000,
+        },
+    }
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Return a client without a configured group, shared across the module."""
+    return SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+    )
+
+
+@pytest.fixture(scope="module")
+def group_client():
+    """Return a client configured with the prefixed group ID, decoded once per module."""
+    return SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+        group_id=GROUP_ID_PREFIXED,
+    )
+
+
+@pytest.fixture(scope="module")
+def stub_adapter():
+    """Return one transport adapter shared by every wired client test."""
+    return StubAdapter()
+
+
+@pytest.fixture(scope="module")
+def wired_client(stub_adapter):
+    """Return a group client whose real session is served by the stub adapter."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+        group_id="group.abc123",
+    )
+    client._session.mount(API_URL, stub_adapter)
+    return client
+
+
+@pytest.fixture
+def stub(stub_adapter):
+    """Return the shared stub adapter with routes and history cleared."""
+    stub_adapter.reset()
+    return stub_adapter
+
+
+# Tests for SignalClient initialization.
+def test_init_basic():
+    """Test basic initialization."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+    )
+
+    assert client.api_url == API_URL
+    assert client.phone_number == PHONE
+    assert client.group_id is None
+    assert client._internal_group_id is None
+
+
+def test_init_with_trailing_slash():
+    """Test that trailing slash is stripped from URL."""
+    client = SignalClient(
+        api_url=f"{API_URL}/",
+        phone_number=PHONE,
+    )
+
+    assert client.api_url == API_URL
+
+
+def test_init_ws_url_conversion():
+    """Test websocket URL is correctly derived."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+    )
+    assert client._ws_url == "ws://localhost:8080"
+
+    client = SignalClient(
+        api_url="https://secure.example.com:8080",
+        phone_number=PHONE,
+    )
+    assert client._ws_url == "wss://secure.example.com:8080"
 
 
-class TestSignalClientInit:
-    """Tests for SignalClient initialization."""
-
-    def test_init_basic(self):
-        """Test basic initialization."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        assert client.api_url == "http://localhost:8080"
-        assert client.phone_number == "+1234567890"
-        assert client.group_id is None
-        assert client._internal_group_id is None
-
-    def test_init_with_trailing_slash(self):
-        """Test that trailing slash is stripped from URL."""
-        client = SignalClient(
-            api_url="http://localhost:8080/",
-            phone_number="+1234567890",
-        )
-
-        assert client.api_url == "http://localhost:8080"
-
-    def test_init_ws_url_conversion(self):
-        """Test websocket URL is correctly derived."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        assert client._ws_url == "ws://localhost:8080"
-
-        client = SignalClient(
-            api_url="https://secure.example.com:8080",
-            phone_number="+1234567890",
-        )
-        assert client._ws_url == "wss://secure.example.com:8080"
-
-    def test_init_with_group_id_prefixed(self):
-        """Test initialization with group. prefixed group ID."""
-        # Base64 encode "testgroupid" -> dGVzdGdyb3VwaWQ=
-        group_id = "group.dGVzdGdyb3VwaWQ="
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id=group_id,
-        )
-
-        assert client.group_id == group_id
-        assert client._internal_group_id == "testgroupid"
-
-    def test_init_with_group_id_raw(self):
-        """Test initialization with raw group ID (no prefix)."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="rawgroupid",
-        )
-
-        assert client.group_id == "rawgroupid"
-        assert client._internal_group_id == "rawgroupid"
-
-    def test_init_with_invalid_base64_group(self):
-        """Test initialization with invalid base64 in group ID."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.invalid!!!base64",
-        )
-
-        # Should fall back to the original group_id
-        assert client.group_id == "group.invalid!!!base64"
-
-
-class TestSignalClientIsOurGroup:
-    """Tests for SignalClient.is_our_group() method."""
-
-    def test_is_our_group_matching(self):
-        """Test matching group ID."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.dGVzdGdyb3VwaWQ=",
-        )
-
-        assert client.is_our_group("testgroupid") is True
-
-    def test_is_our_group_not_matching(self):
-        """Test non-matching group ID."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.dGVzdGdyb3VwaWQ=",
-        )
-
-        assert client.is_our_group("othergroupid") is False
-
-    def test_is_our_group_none_incoming(self):
-        """Test with None incoming group ID."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.dGVzdGdyb3VwaWQ=",
-        )
-
-        assert client.is_our_group(None) is False
-
-    def test_is_our_group_no_configured_group(self):
-        """Test when no group is configured."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        assert client.is_our_group("anygroupid") is False
-
-
-class TestSignalClientSendMessage:
-    """Tests for SignalClient.send_message() method."""
-
-    def test_send_message_to_group(self):
-        """Test sending message to group."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.abc123",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"timestamp": 123456}
-        mock_response.raise_for_status = MagicMock()
-        client._session.post.return_value = mock_response
-
-        result = client.send_message("Hello!")
-
-        assert result is True
-        client._session.post.assert_called_once()
-        call_args = client._session.post.call_args
-        assert call_args[1]["json"]["message"] == "Hello!"
-        assert "group.abc123" in call_args[1]["json"]["recipients"]
-
-    def test_send_message_to_recipient(self):
-        """Test sending message to specific recipient."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"timestamp": 123456}
-        mock_response.raise_for_status = MagicMock()
-        client._session.post.return_value = mock_response
-
-        result = client.send_message("Hello!", recipient="+0987654321")
-
-        assert result is True
-        call_args = client._session.post.call_args
-        assert "+0987654321" in call_args[1]["json"]["recipients"]
-
-    def test_send_message_no_recipient_no_group(self):
-        """Test sending message without recipient or group fails."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
+def test_init_with_group_id_prefixed(group_client):
+    """Test initialization with group. prefixed group ID."""
+    assert group_client.group_id == GROUP_ID_PREFIXED
+    assert group_client._internal_group_id == GROUP_ID_DECODED
 
-        result = client.send_message("Hello!")
-
-        assert result is False
-        client._session.post.assert_not_called()
-
-    def test_send_message_with_error_response(self):
-        """Test handling error response from API."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.abc123",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"error": "Rate limited"}
-        mock_response.raise_for_status = MagicMock()
-        client._session.post.return_value = mock_response
-
-        result = client.send_message("Hello!")
-
-        assert result is False
-
-    def test_send_message_exception(self):
-        """Test handling exception during send."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.abc123",
-        )
-        client._session = MagicMock()
-
-        client._session.post.side_effect = Exception("Connection failed")
-
-        result = client.send_message("Hello!")
-
-        assert result is False
-
-
-class TestSignalClientSendToGroup:
-    """Tests for SignalClient.send_to_group() method."""
-
-    def test_send_to_group_success(self):
-        """Test successful group message."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.abc123",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"timestamp": 123456}
-        mock_response.raise_for_status = MagicMock()
-        client._session.post.return_value = mock_response
-
-        result = client.send_to_group("Hello group!")
-
-        assert result is True
-
-    def test_send_to_group_no_group_configured(self):
-        """Test send_to_group without configured group."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        result = client.send_to_group("Hello!")
-
-        assert result is False
-
-
-class TestSignalClientSendDM:
-    """Tests for SignalClient.send_dm() method."""
-
-    def test_send_dm_success(self):
-        """Test successful direct message."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"timestamp": 123456}
-        mock_response.raise_for_status = MagicMock()
-        client._session.post.return_value = mock_response
+def test_init_with_group_id_raw():
+    """Test initialization with raw group ID (no prefix)."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+        group_id="rawgroupid",
+    )
 
-        result = client.send_dm("Hello!", "+0987654321")
+    assert client.group_id == "rawgroupid"
+    assert client._internal_group_id == "rawgroupid"
 
-        assert result is True
-        call_args = client._session.post.call_args
-        assert "+0987654321" in call_args[1]["json"]["recipients"]
 
+def test_init_with_invalid_base64_group():
+    """Test initialization with invalid base64 in group ID."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+        group_id=INVALID_GROUP_ID,
+    )
 
-class TestSignalClientParseMessage:
-    """Tests for SignalClient._parse_message() method."""
+    # Should fall back to the original group_id
+    assert client.group_id == INVALID_GROUP_ID
 
-    def test_parse_simple_message(self):
-        """Test parsing a simple text message."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
 
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "sourceName": "TestUser",
-                "sourceUuid": "uuid-123",
-                "dataMessage": {
-                    "message": "Hello, world!",
-                    "timestamp": 1234567890000,
-                },
-            }
-        }
+# Tests for SignalClient.is_our_group() method.
+@pytest.fixture(params=[("group_client", True), ("client", False)], ids=["with_group", "no_group"])
+def client_variant(request):
+    """Return a shared module-scoped client and whether it has a group configured."""
+    fixture_name, has_group = request.param
+    return request.getfixturevalue(fixture_name), has_group
 
-        msg = client._parse_message(raw)
 
-        assert msg is not None
-        assert msg.sender == "TestUser"
-        assert msg.sender_uuid == "uuid-123"
-        assert msg.text == "Hello, world!"
-        assert msg.timestamp == 1234567890000
-        assert msg.is_group is False
-
-    def test_parse_group_message(self):
-        """Test parsing a group message."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-            group_id="group.dGVzdGdyb3VwaWQ=",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "sourceName": "TestUser",
-                "sourceUuid": "uuid-123",
-                "dataMessage": {
-                    "message": "Hello group!",
-                    "timestamp": 1234567890000,
-                    "groupInfo": {
-                        "groupId": "testgroupid",
-                    },
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+@pytest.mark.parametrize(
+    "incoming",
+    [GROUP_ID_DECODED, "othergroupid", None],
+    ids=["matching", "not_matching", "none_incoming"],
+)
+def test_is_our_group(client_variant, incoming):
+    """Test only our decoded group ID matches, and never without a configured group."""
+    client, has_group = client_variant
+    expected = has_group and incoming == GROUP_ID_DECODED
 
-        assert msg is not None
-        assert msg.is_group is True
-        assert msg.group_id == "testgroupid"
-
-    def test_parse_message_with_attachments(self):
-        """Test parsing message with attachments."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "sourceName": "TestUser",
-                "dataMessage": {
-                    "message": "Check this out",
-                    "timestamp": 1234567890000,
-                    "attachments": [
-                        {"contentType": "image/jpeg", "filename": "photo.jpg"},
-                    ],
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+    assert client.is_our_group(incoming) is expected
 
-        assert msg is not None
-        assert len(msg.attachments) == 1
-        assert msg.attachments[0].content_type == "image/jpeg"
-
-    def test_parse_message_with_mentions(self):
-        """Test parsing message with mentions."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "sourceName": "TestUser",
-                "dataMessage": {
-                    "message": "\ufffc check this",
-                    "timestamp": 1234567890000,
-                    "mentions": [
-                        {"start": 0, "length": 1, "name": "Alice"},
-                    ],
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
 
-        assert msg is not None
-        assert len(msg.mentions) == 1
-        assert msg.mentions[0].name == "Alice"
-
-    def test_parse_message_with_sticker(self):
-        """Test parsing message with sticker."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "sourceName": "TestUser",
-                "dataMessage": {
-                    "message": "",
-                    "timestamp": 1234567890000,
-                    "sticker": {"packId": "abc", "stickerId": 1},
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+# Tests for SignalClient.send_message() method.
+def test_send_message_to_group(wired_client, stub):
+    """Test sending message to group."""
+    stub.add("POST", "/v2/send", json={"timestamp": 123456})
 
-        assert msg is not None
-        assert msg.has_sticker is True
+    result = wired_client.send_message("Hello!")
 
-    def test_parse_message_no_data_message(self):
-        """Test parsing envelope without dataMessage returns None."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
+    assert result is True
+    assert len(stub.requests) == 1
+    assert stub.requests[0].headers["Content-Type"] == "application/json"
+    payload = stub.last_json()
+    assert payload["message"] == "Hello!"
+    assert "group.abc123" in payload["recipients"]
 
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-            }
-        }
 
-        msg = client._parse_message(raw)
+def test_send_message_to_recipient(wired_client, stub):
+    """Test sending message to specific recipient."""
+    stub.add("POST", "/v2/send", json={"timestamp": 123456})
 
-        assert msg is None
+    result = wired_client.send_message("Hello!", recipient=OTHER_PHONE)
 
-    def test_parse_message_empty_content(self):
-        """Test parsing message with no content returns None."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "dataMessage": {
-                    "message": "",
-                    "timestamp": 1234567890000,
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+    assert result is True
+    assert stub.last_json()["recipients"] == [OTHER_PHONE]
 
-        assert msg is None
 
-    def test_parse_message_from_self(self):
-        """Test parsing message from self returns None."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+1234567890",  # Same as client
-                "dataMessage": {
-                    "message": "Hello",
-                    "timestamp": 1234567890000,
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+def test_send_message_no_recipient_no_group(stub):
+    """Test sending message without recipient or group fails."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+    )
+    client._session.mount(API_URL, stub)
+    stub.add("POST", "/v2/send", json={"timestamp": 123456})
 
-        assert msg is None
+    result = client.send_message("Hello!")
 
-    def test_parse_message_sender_fallback(self):
-        """Test sender falls back to source number if no name."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-
-        raw = {
-            "envelope": {
-                "sourceNumber": "+0987654321",
-                "dataMessage": {
-                    "message": "Hello",
-                    "timestamp": 1234567890000,
-                },
-            }
-        }
-
-        msg = client._parse_message(raw)
+    assert result is False
+    assert stub.requests == []
 
-        assert msg is not None
-        assert msg.sender == "+0987654321"
 
+def test_send_message_with_error_response(wired_client, stub):
+    """Test handling error response from API."""
+    stub.add("POST", "/v2/send", json={"error": "Rate limited"})
+
+    result = wired_client.send_message("Hello!")
+
+    assert result is False
+
+
+def test_send_message_http_error(wired_client, stub):
+    """Test that an HTTP error status is reported as a failed send."""
+    stub.add("POST", "/v2/send", status=500, json={"error": "Internal"})
+
+    result = wired_client.send_message("Hello!")
 
-class TestSignalClientSendReadReceipt:
-    """Tests for SignalClient.send_read_receipt() method."""
+    assert result is False
 
-    def test_send_read_receipt_success(self):
-        """Test successful read receipt."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 204
-        client._session.post.return_value = mock_response
+def test_send_message_exception(wired_client, stub):
+    """Test handling exception during send."""
+    stub.add("POST", "/v2/send", exc=requests.ConnectionError("Connection failed"))
 
-        result = client.send_read_receipt("+0987654321", 1234567890000)
+    result = wired_client.send_message("Hello!")
 
-        assert result is True
+    assert result is False
 
-    def test_send_read_receipt_failure(self):
-        """Test failed read receipt."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
 
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        client._session.post.return_value = mock_response
+# Tests for SignalClient.send_to_group() method.
+def test_send_to_group_success(wired_client, stub):
+    """Test successful group message."""
+    stub.add("POST", "/v2/send", json={"timestamp": 123456})
 
-        result = client.send_read_receipt("+0987654321", 1234567890000)
-
-        assert result is False
-
-    def test_send_read_receipt_exception(self):
-        """Test read receipt with exception."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
-
-        client._session.post.side_effect = Exception("Connection failed")
-
-        result = client.send_read_receipt("+0987654321", 1234567890000)
-
-        assert result is False
-
-
-class TestSignalClientHealthCheck:
-    """Tests for SignalClient.health_check() method."""
-
-    def test_health_check_success(self):
-        """Test successful health check."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        client._session.get.return_value = mock_response
-
-        result = client.health_check()
-
-        assert result is True
-        client._session.get.assert_called_with(
-            "http://localhost:8080/v1/about",
-            timeout=5,
-        )
-
-    def test_health_check_failure(self):
-        """Test failed health check."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
-
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        client._session.get.return_value = mock_response
-
-        result = client.health_check()
-
-        assert result is False
-
-    def test_health_check_exception(self):
-        """Test health check with exception."""
-        client = SignalClient(
-            api_url="http://localhost:8080",
-            phone_number="+1234567890",
-        )
-        client._session = MagicMock()
-
-        client._session.get.side_effect = Exception("Connection refused")
-
-        result = client.health_check()
-
-        assert result is False
-
-
-class TestSignalMessage:
-    """Tests for SignalMessage dataclass."""
-
-    def test_signal_message_defaults(self):
-        """Test SignalMessage default values."""
-        msg = SignalMessage(
-            sender="TestUser",
-            sender_uuid="uuid-123",
-            text="Hello",
-            timestamp=1234567890000,
-        )
-
-        assert msg.group_id is None
-        assert msg.is_group is False
-        assert msg.attachments == []
-        assert msg.has_sticker is False
-        assert msg.mentions == []
-
-    def test_signal_message_equality(self):
-        """Test SignalMessage equality."""
-        msg1 = SignalMessage(
-            sender="User",
-            sender_uuid="uuid",
-            text="Hello",
-            timestamp=123,
-        )
-        msg2 = SignalMessage(
-            sender="User",
-            sender_uuid="uuid",
-            text="Hello",
-            timestamp=123,
-        )
-
-        assert msg1 == msg2
+    result = wired_client.send_to_group("Hello group!")
+
+    assert result is True
+
+
+def test_send_to_group_no_group_configured():
+    """Test send_to_group without configured group."""
+    client = SignalClient(
+        api_url=API_URL,
+        phone_number=PHONE,
+    )
+
+    result = client.send_to_group("Hello!")
+
+    assert result is False
+
+
+# Tests for SignalClient.send_dm() method.
+def test_send_dm_success(wired_client, stub):
+    """Test successful direct message."""
+    stub.add("POST", "/v2/send", json={"timestamp": 123456})
+
+    result = wired_client.send_dm("Hello!", OTHER_PHONE)
+
+    assert result is True
+    assert OTHER_PHONE in stub.last_json()["recipients"]
+
+
+# Tests for SignalClient._parse_message() method.
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        (
+            RAW_SIMPLE,
+            {
+                "sender": "TestUser",
+                "sender_uuid": "uuid-123",
+                "text": "Hello, world!",
+                "timestamp": 1234567890000,
+                "is_group": False,
+            },
+        ),
+        (RAW_GROUP, {"is_group": True, "group_id": GROUP_ID_DECODED}),
+        (RAW_ATTACHMENTS, {"attachments": [Attachment(content_type="image/jpeg", filename="photo.jpg")]}),
+        (RAW_MENTIONS, {"mentions": [Mention(start=0, length=1, name="Alice")]}),
+        (RAW_STICKER, {"has_sticker": True}),
+        (RAW_NO_DATAMSG, None),
+        (RAW_EMPTY, None),
+        (RAW_FROM_SELF, None),
+        (RAW_NO_NAME, {"sender": OTHER_PHONE}),
+    ],
+    ids=[
+        "simple",
+        "group",
+        "attachments",
+        "mentions",
+        "sticker",
+        "no_data_message",
+        "empty_content",
+        "from_self",
+        "sender_fallback",
+    ],
+)
+def test_parse_message(client, raw, expected):
+    """Test parsing raw envelopes, or rejecting them when expected is None."""
+    msg = client._parse_message(raw)
+
+    if expected is None:
+        assert msg is None
+    else:
+        assert msg is not None
+        assert {attr: getattr(msg, attr) for attr in expected} == expected
+
+
+# Tests for SignalClient.send_read_receipt() method.
+@pytest.mark.parametrize(
+    "status,side_effect,expected",
+    [
+        (204, None, True),
+        (400, None, False),
+        (None, requests.ConnectionError("Connection failed"), False),
+    ],
+    ids=["success", "failure", "exception"],
+)
+def test_send_read_receipt(wired_client, stub, status, side_effect, expected):
+    """Test read receipt result for success, error status and exception."""
+    stub.add("POST", f"/v1/receipts/{PHONE}", status=status or 200, exc=side_effect)
+
+    result = wired_client.send_read_receipt(OTHER_PHONE, 1234567890000)
+
+    assert result is expected
+    assert stub.last_json() == {
+        "receipt_type": "read",
+        "recipient": OTHER_PHONE,
+        "timestamp": 1234567890000,
+    }
+
+
+# Tests for SignalClient.health_check() method.
+@pytest.mark.parametrize(
+    "status,side_effect,expected",
+    [
+        (200, None, True),
+        (500, None, False),
+        (None, requests.ConnectionError("Connection refused"), False),
+    ],
+    ids=["success", "failure", "exception"],
+)
+def test_health_check(wired_client, stub, status, side_effect, expected):
+    """Test health check result for success, error status and exception."""
+    stub.add("GET", "/v1/about", status=status or 200, exc=side_effect)
+
+    result = wired_client.health_check()
+
+    assert result is expected
+    assert stub.requests[-1].url == f"{API_URL}/v1/about"
+    assert stub.timeouts[-1] == 5
+
+
+# Tests for SignalMessage dataclass.
+def test_signal_message_defaults():
+    """Test SignalMessage default values."""
+    defaults = {
+        f.name: f.default if f.default is not dataclasses.MISSING else f.default_factory()
+        for f in dataclasses.fields(SignalMessage)
+        if f.default is not dataclasses.MISSING or f.default_factory is not dataclasses.MISSING
+    }
+
+    assert defaults == {
+        "group_id": None,
+        "is_group": False,
+        "attachments": [],
+        "has_sticker": False,
+        "mentions": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        ("User", "uuid", "Hello", 123),
+        ("User", None, "Hello", 123),
+        ("Other", "uuid-2", "", 0),
+    ],
+)
+def test_signal_message_equality(fields):
+    """Test SignalMessage instances with the same fields compare equal."""
+    assert SignalMessage(*fields) == SignalMessage(*fields)
+
+
+@pytest.mark.parametrize(
+    "fields,other",
+    [
+        (("User", "uuid", "Hello", 123), ("Other", "uuid", "Hello", 123)),
+        (("User", "uuid", "Hello", 123), ("User", "uuid-2", "Hello", 123)),
+        (("User", "uuid", "Hello", 123), ("User", "uuid", "Bye", 123)),
+        (("User", "uuid", "Hello", 123), ("User", "uuid", "Hello", 456)),
+    ],
+    ids=["sender", "sender_uuid", "text", "timestamp"],
+)
+def test_signal_message_inequality(fields, other):
+    """Test SignalMessage instances differing in one field compare unequal."""
+    assert SignalMessage(*fields) != SignalMessage(*other)
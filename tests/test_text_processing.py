@@ -1,13 +1,20 @@
 """Tests for text_processing module."""
 
+import dataclasses
+from unittest.mock import patch
+
+import pytest
+
 from text_processing import (
     Attachment,
     Mention,
     CONTENT_TYPE_NAMES,
+    clear_emoji_caches,
     emoji_to_shortcode,
     shortcode_to_emoji,
     format_attachment,
     format_attachments,
+    STICKER_TAG,
     format_sticker,
     replace_mentions,
     process_signal_to_game,
@@ -15,6 +22,8 @@ from text_processing import (
     parse_attachments,
     parse_mentions,
     MENTION_PLACEHOLDER,
+    _demojize_cached,
+    _emojize_cached,
 )
 
 
@@ -54,6 +63,16 @@ class TestAttachment:
         attachment = Attachment(content_type="x-custom/type")
         assert attachment.display_type == "File"
 
+        attachment = Attachment(content_type="image")
+        assert attachment.display_type == "File"
+
+    def test_attachment_is_frozen(self):
+        """Test attachments are immutable so the derived display_type stays valid."""
+        attachment = Attachment(content_type="image/jpeg")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            attachment.content_type = "application/pdf"  # type: ignore[misc]
+        assert attachment.display_type == "Image"
+
 
 class TestEmojiConversion:
     """Tests for emoji conversion functions."""
@@ -78,6 +97,12 @@ class TestEmojiConversion:
         result = emoji_to_shortcode("\U0001F44D\U0001F44E")  # thumbs up, thumbs down
         assert ":" in result  # Should contain shortcodes
 
+    def test_emoji_to_shortcode_composite_sequences(self):
+        """Test multi-codepoint emojis convert as one shortcode, not their parts."""
+        # heart on fire (ZWJ sequence) and thumbs up with a skin tone modifier
+        result = emoji_to_shortcode("\u2764\ufe0f\u200d\U0001F525 \U0001F44D\U0001F3FD")
+        assert result == ":heart_on_fire: :thumbs_up_medium_skin_tone:"
+
     def test_shortcode_to_emoji_basic(self):
         """Test basic shortcode to emoji conversion."""
         result = shortcode_to_emoji(":grinning_face:")
@@ -100,6 +125,41 @@ class TestEmojiConversion:
         # Should restore to original or equivalent
         assert "\U0001F44D" in restored or "thumbs" in shortcode.lower()
 
+    def test_repeated_conversion_hits_cache(self):
+        """Test repeated conversions are served from the caches."""
+        clear_emoji_caches()
+        first = emoji_to_shortcode("ok \U0001F642")
+        assert emoji_to_shortcode("ok \U0001F642") == first
+        assert _demojize_cached.cache_info().hits == 1
+
+        restored = shortcode_to_emoji(first)
+        assert shortcode_to_emoji(first) == restored
+        assert _emojize_cached.cache_info().hits == 1
+
+    def test_ascii_text_bypasses_emoji_library(self):
+        """Test plain ASCII text is returned without calling the emoji library."""
+        with patch("text_processing._demojize") as demojize:
+            assert emoji_to_shortcode("plain ascii :) only") == "plain ascii :) only"
+        demojize.assert_not_called()
+
+    def test_text_without_colon_bypasses_emoji_library(self):
+        """Test text without a colon is returned without calling the emoji library."""
+        with patch("text_processing._emojize") as emojize:
+            assert shortcode_to_emoji("caf\u00e9 \U0001F44D") == "caf\u00e9 \U0001F44D"
+            assert shortcode_to_emoji("Note: back at 12") == "Note: back at 12"
+        emojize.assert_not_called()
+
+    def test_clear_emoji_caches(self):
+        """Test clearing the caches empties both of them."""
+        emoji_to_shortcode("ok \U0001F642")
+        shortcode_to_emoji(":thumbs_up:")
+        assert _demojize_cached.cache_info().currsize > 0
+        assert _emojize_cached.cache_info().currsize > 0
+
+        clear_emoji_caches()
+        assert _demojize_cached.cache_info().currsize == 0
+        assert _emojize_cached.cache_info().currsize == 0
+
 
 class TestFormatAttachment:
     """Tests for format_attachment function."""
@@ -187,6 +247,10 @@ class TestFormatSticker:
         """Test sticker formatting."""
         assert format_sticker() == "[Sticker]"
 
+    def test_format_sticker_matches_tag(self):
+        """Test format_sticker returns the shared STICKER_TAG constant."""
+        assert format_sticker() is STICKER_TAG
+
 
 class TestReplaceMentions:
     """Tests for replace_mentions function."""
@@ -243,6 +307,66 @@ class TestReplaceMentions:
         assert result.startswith("@First")
         assert result.endswith("@Second")
 
+    def test_replace_skips_placeholder_without_mention(self):
+        """Test a placeholder with no mention at its position is left alone."""
+        text = f"{MENTION_PLACEHOLDER} and {MENTION_PLACEHOLDER}"
+        mentions = [Mention(start=6, length=1, name="Bob")]
+        result = replace_mentions(text, mentions)
+        assert result == f"{MENTION_PLACEHOLDER} and @Bob"
+
+    def test_replace_keeps_trailing_placeholders(self):
+        """Test placeholders after the last mention are kept verbatim."""
+        text = f"{MENTION_PLACEHOLDER} hi {MENTION_PLACEHOLDER}{MENTION_PLACEHOLDER}"
+        mentions = [Mention(start=0, length=1, name="Alice")]
+        result = replace_mentions(text, mentions)
+        assert result == f"@Alice hi {MENTION_PLACEHOLDER}{MENTION_PLACEHOLDER}"
+
+    def test_replace_drops_duplicate_mention(self):
+        """Test a second mention on the same span is ignored."""
+        text = f"hi {MENTION_PLACEHOLDER}!"
+        mentions = [
+            Mention(start=3, length=1, name="Alice"),
+            Mention(start=3, length=1, name="Bob"),
+        ]
+        assert replace_mentions(text, mentions) == "hi @Alice!"
+
+    def test_replace_drops_overlapping_mention(self):
+        """Test a mention overlapping an earlier span is ignored."""
+        text = f"{MENTION_PLACEHOLDER}{MENTION_PLACEHOLDER} x"
+        mentions = [
+            Mention(start=0, length=2, name="Alice"),
+            Mention(start=1, length=1, name="Bob"),
+        ]
+        assert replace_mentions(text, mentions) == "@Alice x"
+
+    def test_replace_skips_drifted_span(self):
+        """Test a span running past its placeholder is not spliced."""
+        text = f"{MENTION_PLACEHOLDER}abc"
+        mentions = [Mention(start=0, length=3, name="Alice")]
+        assert replace_mentions(text, mentions) == text
+
+    def test_replace_skips_zero_length_mention(self):
+        """Test a zero-length mention leaves the placeholder alone."""
+        text = f"hi {MENTION_PLACEHOLDER}"
+        mentions = [Mention(start=3, length=0, name="Alice")]
+        assert replace_mentions(text, mentions) == text
+
+    def test_replace_uuid_without_placeholder(self):
+        """Test @UUID mentions are replaced when the text has no placeholder."""
+        mentions = [Mention(start=3, length=7, name="Alice", uuid="uuid-a")]
+        result = replace_mentions("hi @uuid-a!", mentions)
+        assert result == "hi @Alice!"
+
+    def test_replace_uuid_and_placeholder(self):
+        """Test @UUID text and placeholder mentions in the same message."""
+        text = f"@uuid-a and {MENTION_PLACEHOLDER}"
+        mentions = [
+            Mention(start=0, length=7, name="Alice", uuid="uuid-a"),
+            Mention(start=12, length=1, name="Bob"),
+        ]
+        result = replace_mentions(text, mentions)
+        assert result == "@Alice and @Bob"
+
 
 class TestProcessSignalToGame:
     """Tests for process_signal_to_game function."""
@@ -264,6 +388,11 @@ class TestProcessSignalToGame:
         assert "Check this out" in result
         assert "[Image]" in result
 
+    def test_process_text_with_empty_attachments(self):
+        """Test an empty attachment list takes the text-only path."""
+        result = process_signal_to_game("Hello", attachments=[])
+        assert result == "Hello"
+
     def test_process_sticker_only(self):
         """Test processing sticker-only message."""
         result = process_signal_to_game("", has_sticker=True)
@@ -381,6 +510,13 @@ class TestParseAttachments:
         assert len(result) == 1
         assert result[0].content_type == "application/octet-stream"
 
+    def test_parse_attachment_with_null_content_type(self):
+        """Test parsing attachment with a null contentType uses default."""
+        result = parse_attachments([{"contentType": None}])
+
+        assert result[0].content_type == "application/octet-stream"
+        assert result[0].display_type == "File"
+
 
 class TestParseMentions:
     """Tests for parse_mentions function."""
@@ -468,3 +604,8 @@ class TestContentTypeNames:
         doc_types = ["application/pdf", "application/msword", "text/plain", "text/csv"]
         for ct in doc_types:
             assert ct in CONTENT_TYPE_NAMES
+
+    def test_content_type_names_read_only(self):
+        """Test the content type mapping cannot be modified at runtime."""
+        with pytest.raises(TypeError):
+            CONTENT_TYPE_NAMES["application/x-test"] = "Test"  # type: ignore[index]
@@ -1,13 +1,16 @@
 """Text processing utilities for emoji conversion and attachment handling."""
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional
 
-import emoji
+from emoji import demojize as _demojize, emojize as _emojize
 
 
-# Content type to display name mapping
-CONTENT_TYPE_NAMES: dict[str, str] = {
+# Content type to display name mapping (read-only)
+CONTENT_TYPE_NAMES: Mapping[str, str] = MappingProxyType({
     # Images
     "image/jpeg": "Image",
     "image/jpg": "Image",
@@ -45,10 +48,32 @@ CONTENT_TYPE_NAMES: dict[str, str] = {
     "text/csv": "CSV",
     "application/json": "JSON",
     "application/xml": "XML",
+})
+_CT_GET = CONTENT_TYPE_NAMES.get
+
+# Generic display names by MIME type prefix, used when the full type is not mapped
+_PREFIX_NAMES: dict[str, str] = {
+    "image": "Image",
+    "audio": "Audio",
+    "video": "Video",
+    "text": "Text File",
 }
 
-
-@dataclass
+# Display types whose filename is informative enough to show alongside the type
+_FILENAME_TYPES = frozenset({
+    "PDF",
+    "Document",
+    "Spreadsheet",
+    "Presentation",
+    "Archive",
+    "Text File",
+    "CSV",
+    "JSON",
+    "XML",
+})
+
+
+@dataclass(slots=True)
 class Mention:
     """Represents a Signal message mention (@someone)."""
 
@@ -58,7 +83,21 @@ class Mention:
     uuid: Optional[str] = None
 
 
-@dataclass
+def _compute_display_type(content_type: str) -> str:
+    """Map a MIME content type to a human-readable attachment type."""
+    # Check content type mapping (one lookup instead of membership test + getitem)
+    name = _CT_GET(content_type)
+    if name is not None:
+        return name
+
+    # Fallback to generic categories based on mime type prefix, else a generic file
+    prefix, slash, _ = content_type.partition("/")
+    if not slash:
+        return "File"
+    return _PREFIX_NAMES.get(prefix, "File")
+
+
+@dataclass(frozen=True, slots=True)
 class Attachment:
     """Represents a Signal message attachment."""
 
@@ -66,26 +105,31 @@ class Attachment:
     filename: Optional[str] = None
     size: Optional[int] = None
     id: Optional[str] = None
+    # Human-readable attachment type, derived once from content_type
+    display_type: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "display_type", _compute_display_type(self.content_type))
+
+
+# Chat traffic repeats the same short messages constantly, so cache conversions
+_EMOJI_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_EMOJI_CACHE_SIZE)
+def _demojize_cached(text: str) -> str:
+    return _demojize(text)
 
-    @property
-    def display_type(self) -> str:
-        """Get human-readable attachment type."""
-        # Check content type mapping
-        if self.content_type in CONTENT_TYPE_NAMES:
-            return CONTENT_TYPE_NAMES[self.content_type]
-
-        # Fallback to generic categories based on mime type prefix
-        if self.content_type.startswith("image/"):
-            return "Image"
-        elif self.content_type.startswith("audio/"):
-            return "Audio"
-        elif self.content_type.startswith("video/"):
-            return "Video"
-        elif self.content_type.startswith("text/"):
-            return "Text File"
-
-        # Default
-        return "File"
+
+@lru_cache(maxsize=_EMOJI_CACHE_SIZE)
+def _emojize_cached(text: str) -> str:
+    return _emojize(text)
+
+
+def clear_emoji_caches() -> None:
+    """Clear the cached emoji/shortcode conversions."""
+    _demojize_cached.cache_clear()
+    _emojize_cached.cache_clear()
 
 
 def emoji_to_shortcode(text: str) -> str:
@@ -97,10 +141,11 @@ def emoji_to_shortcode(text: str) -> str:
     Returns:
         Text with emojis converted to shortcodes
     """
-    if not text:
+    # Every emoji is non-ASCII, so plain ASCII text can skip the emoji scan
+    if not text or text.isascii():
         return text
 
-    return emoji.demojize(text)
+    return _demojize_cached(text)
 
 
 def shortcode_to_emoji(text: str) -> str:
@@ -112,10 +157,15 @@ def shortcode_to_emoji(text: str) -> str:
     Returns:
         Text with shortcodes converted to emojis
     """
+    # A shortcode needs an opening and a closing colon; anything less (plain
+    # text, "Note: ...", "12:30") has nothing to convert
     if not text:
         return text
+    first_colon = text.find(":")
+    if first_colon == -1 or text.find(":", first_colon + 1) == -1:
+        return text
 
-    return emoji.emojize(text)
+    return _emojize_cached(text)
 
 
 def format_attachment(attachment: Attachment) -> str:
@@ -135,9 +185,8 @@ def format_attachment(attachment: Attachment) -> str:
 
     # For known types, just show the type
     # But include filename for documents if it's informative
-    if display_type in ("PDF", "Document", "Spreadsheet", "Presentation", "Archive", "Text File", "CSV", "JSON", "XML"):
-        if attachment.filename:
-            return f"[{display_type}: {attachment.filename}]"
+    if display_type in _FILENAME_TYPES and attachment.filename:
+        return f"[{display_type}: {attachment.filename}]"
 
     return f"[{display_type}]"
 
@@ -154,7 +203,15 @@ def format_attachments(attachments: list[Attachment]) -> str:
     if not attachments:
         return ""
 
-    return " ".join(format_attachment(a) for a in attachments)
+    # Most messages carry a single attachment; skip the join entirely
+    if len(attachments) == 1:
+        return format_attachment(attachments[0])
+
+    return " ".join([format_attachment(a) for a in attachments])
+
+
+# Sticker indicator shown in game chat
+STICKER_TAG = "[Sticker]"
 
 
 def format_sticker() -> str:
@@ -163,7 +220,7 @@ def format_sticker() -> str:
     Returns:
         Formatted sticker string
     """
-    return "[Sticker]"
+    return STICKER_TAG
 
 
 # Unicode Object Replacement Character - used by Signal as placeholder for mentions
@@ -191,20 +248,35 @@ def replace_mentions(text: str, mentions: list[Mention]) -> str:
 
     result = text
 
-    # First, try replacing @UUID patterns with @Name
+    # First, replace placeholder characters in one left-to-right walk. Mention
+    # positions refer to the original text, so this runs before anything changes
+    # its length. A mention is only spliced if its whole span is placeholders and
+    # it starts after the previous one ends; drifted, empty, duplicate or
+    # overlapping spans are dropped. Text without placeholders (@UUID style,
+    # edits, forwards) skips the sort and walk entirely.
+    if MENTION_PLACEHOLDER in text:
+        parts: list[str] = []
+        cursor = 0
+        for mention in sorted(mentions, key=lambda m: m.start):
+            start = mention.start
+            length = mention.length
+            if (
+                start < cursor
+                or length < 1
+                or text[start:start + length] != MENTION_PLACEHOLDER * length
+            ):
+                continue
+            parts.append(text[cursor:start])
+            parts.append(f"@{mention.name}")
+            cursor = start + length
+        parts.append(text[cursor:])
+        result = "".join(parts)
+
+    # Then, replace @UUID patterns with @Name
     for mention in mentions:
         if mention.uuid:
             result = result.replace(f"@{mention.uuid}", f"@{mention.name}")
 
-    # Then, handle placeholder characters (sort by position in reverse)
-    sorted_mentions = sorted(mentions, key=lambda m: m.start, reverse=True)
-    for mention in sorted_mentions:
-        start = mention.start
-        end = start + mention.length
-        # Only replace if there's a placeholder character at this position
-        if start < len(result) and result[start] == MENTION_PLACEHOLDER:
-            result = result[:start] + f"@{mention.name}" + result[end:]
-
     return result
 
 
@@ -227,22 +299,25 @@ def process_signal_to_game(
     Returns:
         Processed text suitable for game chat
     """
-    parts = []
-
     # Process text: replace mentions, then convert emojis
     if text:
-        processed_text = replace_mentions(text, mentions or [])
-        parts.append(emoji_to_shortcode(processed_text))
+        processed_text = emoji_to_shortcode(replace_mentions(text, mentions or []))
+        # Text-only messages are the common case; no list or join needed
+        if not has_sticker and not attachments:
+            return processed_text
+        parts = [processed_text]
+    else:
+        parts = []
 
     # Add sticker indicator
     if has_sticker:
-        parts.append(format_sticker())
+        parts.append(STICKER_TAG)
 
-    # Add attachment indicators
+    # Add attachment indicators (straight into parts, so everything is joined once)
     if attachments:
-        parts.append(format_attachments(attachments))
+        parts.extend([format_attachment(a) for a in attachments])
 
-    return " ".join(parts) if parts else ""
+    return " ".join(parts)
 
 
 def process_game_to_signal(text: str) -> str:
@@ -271,15 +346,16 @@ def parse_attachments(raw_attachments: list[dict]) -> list[Attachment]:
     Returns:
         List of Attachment objects
     """
-    attachments = []
-    for raw in raw_attachments:
-        attachments.append(Attachment(
-            content_type=raw.get("contentType", "application/octet-stream"),
-            filename=raw.get("filename"),
-            size=raw.get("size"),
-            id=raw.get("id"),
-        ))
-    return attachments
+    # Positional in field order: content_type, filename, size, id
+    return [
+        Attachment(
+            raw.get("contentType") or "application/octet-stream",
+            raw.get("filename"),
+            raw.get("size"),
+            raw.get("id"),
+        )
+        for raw in raw_attachments
+    ]
 
 
 def parse_mentions(raw_mentions: list[dict]) -> list[Mention]:
@@ -291,14 +367,13 @@ def parse_mentions(raw_mentions: list[dict]) -> list[Mention]:
     Returns:
         List of Mention objects
     """
-    mentions = []
-    for raw in raw_mentions:
-        # Get name, falling back to number if name not available
-        name = raw.get("name") or raw.get("number") or "Unknown"
-        mentions.append(Mention(
+    return [
+        Mention(
             start=raw.get("start", 0),
             length=raw.get("length", 1),
-            name=name,
+            # Get name, falling back to number if name not available
+            name=raw.get("name") or raw.get("number") or "Unknown",
             uuid=raw.get("uuid"),
-        ))
-    return mentions
+        )
+        for raw in raw_mentions
+    ]